@@ -0,0 +1,34 @@
+"""_bootstrap.py
+Process-wide, load-once access to .env and config.json.
+"""
+import functools
+import os
+import types
+from pathlib import Path
+from typing import Mapping
+
+import orjson
+from dotenv import load_dotenv
+
+CONFIG_PATH = Path(__file__).with_name("config.json")
+
+
+@functools.lru_cache(maxsize=1)
+def env() -> Mapping[str, str]:
+    """Load .env into os.environ once and return a read-only snapshot of the environment."""
+    load_dotenv()
+    return types.MappingProxyType(dict(os.environ))
+
+
+def get_config() -> dict:
+    """Return `config.json`, re-parsing it only when the file's mtime changes.
+
+    Callers share the result and must not mutate it.
+    """
+    return _read_config(CONFIG_PATH.stat().st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=1)
+def _read_config(mtime_ns: int) -> dict:
+    with CONFIG_PATH.open("rb") as f:
+        return orjson.loads(f.read())
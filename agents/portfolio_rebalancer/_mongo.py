@@ -0,0 +1,35 @@
+"""_mongo.py
+Process-wide MongoClient shared by alerts, executor, scheduler and db helpers.
+"""
+import functools
+import os
+from typing import Optional
+
+from ._bootstrap import env
+env()
+
+try:
+    from pymongo import MongoClient
+    PYMONGO_AVAILABLE = True
+except Exception:
+    MongoClient = None  # type: ignore
+    PYMONGO_AVAILABLE = False
+
+
+def get_client(uri: Optional[str] = None):
+    """Return the shared client for `uri` (defaults to MONGO_URI), creating it on first use."""
+    return _client_for(uri or os.getenv("MONGO_URI", "mongodb://localhost:27017"))
+
+
+@functools.lru_cache(maxsize=None)
+def _client_for(uri: str):
+    if not PYMONGO_AVAILABLE:
+        raise RuntimeError("pymongo is not installed. Please 'pip install pymongo' to use MongoDB logging.")
+    # TLS follows the URI (mongodb+srv:// enables it), so local/docker Mongo keeps working.
+    # Log docs are repetitive strings, so wire compression pays off; the server picks the first it supports.
+    return MongoClient(uri, maxPoolSize=20, compressors="zstd,zlib", zlibCompressionLevel=6)
+
+
+def get_db(db_name: Optional[str] = None):
+    """Return a database handle on the shared client (defaults to MONGO_DB_NAME)."""
+    return get_client()[db_name or os.getenv("MONGO_DB_NAME", "loki_agents")]
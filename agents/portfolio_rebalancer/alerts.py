@@ -1,36 +1,68 @@
-import os
+import atexit
+import functools
 import smtplib
+import threading
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 from email.mime.text import MIMEText
-from pymongo import MongoClient
-from datetime import datetime, timezone
-from pathlib import Path
+from typing import Optional
+
+from .db import log_collection
+from ._mongo import get_db
+from .util import now_utc, batch_offset
 
 # Ensure .env variables are loaded before accessing os.getenv
-from dotenv import load_dotenv
-load_dotenv()
+from ._bootstrap import env, get_config
+env()
+
+def _alerts_config() -> dict:
+    """Current `alerts` section of config.json; cheap, since get_config only re-parses on change."""
+    return get_config()["alerts"]
 
-# Load config.json (path relative to this file for reliability)
-import json
-CONFIG_PATH = Path(__file__).with_name("config.json")
-with CONFIG_PATH.open("r", encoding="utf-8") as f:
-    config = json.load(f)
+# MongoDB collection on the shared client, resolved on first write
+@functools.lru_cache(maxsize=1)
+def alerts_collection():
+    return log_collection(get_db(), "rebalance_alerts")
 
-alerts_config = config["alerts"]
+# Shared pool so channel deliveries overlap instead of blocking one after another
+_ALERT_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="alerts")
+ALERT_TIMEOUT_SECONDS = 10
 
-# MongoDB connection (env-overridable)
-mongo_uri = os.getenv("MONGO_URI", "mongodb://localhost:27017/")
-mongo_db_name = os.getenv("MONGO_DB_NAME", "loki_agents")
-client = MongoClient(mongo_uri)
-db = client[mongo_db_name]
-alerts_collection = db["rebalance_alerts"]
+# Keep-alive HTTP session shared by Telegram/Discord so repeat posts skip the TCP+TLS handshake.
+# POSTs are only retried when the message cannot have been delivered: connection failures
+# (nothing sent) and 429/503 (rejected by the service itself). Read errors and 502/504 may
+# follow a delivered message, so they are not retried to avoid duplicate alerts.
+# Worst case per delivery is (HTTP_RETRIES + 1) * sum(HTTP_TIMEOUT) = 8s; the first retry has
+# no backoff and Retry-After is ignored, so this stays inside ALERT_TIMEOUT_SECONDS.
+HTTP_TIMEOUT = (2, 2)  # (connect, read) seconds
+HTTP_RETRIES = 1
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=HTTP_RETRIES,
+            read=False,
+            backoff_factor=0.2,
+            status_forcelist=[429, 503],
+            allowed_methods=frozenset({"POST"}),
+            respect_retry_after_header=False,
+        ),
+    ),
+)
 
 # --- Telegram ---
 def send_telegram_alert(message: str):
     try:
+        alerts_config = _alerts_config()
         url = f"https://api.telegram.org/bot{alerts_config['telegram_bot_token']}/sendMessage"
         data = {"chat_id": alerts_config["telegram_chat_id"], "text": message}
-        r = requests.post(url, data=data)
+        r = _SESSION.post(url, data=data, timeout=HTTP_TIMEOUT)
         r.raise_for_status()
         return "sent", None
     except Exception as e:
@@ -39,34 +71,92 @@ def send_telegram_alert(message: str):
 # --- Discord ---
 def send_discord_alert(message: str):
     try:
-        data = {"content": message}
-        r = requests.post(alerts_config["discord_webhook_url"], json=data)
+        data = orjson.dumps({"content": message})
+        r = _SESSION.post(
+            _alerts_config()["discord_webhook_url"],
+            data=data,
+            headers={"Content-Type": "application/json"},
+            timeout=HTTP_TIMEOUT,
+        )
         r.raise_for_status()
         return "sent", None
     except Exception as e:
         return "failed", str(e)
 
 # --- Email ---
+# Long-lived SMTP session so STARTTLS + AUTH happen once, not per email; guarded by _smtp_lock
+_smtp_conn: Optional[smtplib.SMTP] = None
+_smtp_key: Optional[tuple] = None  # (host, user, password) the open session was created with
+_smtp_lock = threading.Lock()
+
+def _close_smtp():
+    global _smtp_conn
+    if _smtp_conn is not None:
+        try:
+            _smtp_conn.quit()
+        except Exception:
+            pass
+        _smtp_conn = None
+
+def _get_smtp(alerts_config: dict) -> smtplib.SMTP:
+    """Return a live SMTP session for `alerts_config`. Caller holds _smtp_lock.
+
+    Reconnects if the server dropped the session or the SMTP settings changed in config.json.
+    """
+    global _smtp_conn, _smtp_key
+    key = (alerts_config["email_smtp"], alerts_config["email_user"], alerts_config["email_pass"])
+    if _smtp_conn is not None and _smtp_key != key:
+        _close_smtp()
+    if _smtp_conn is not None:
+        try:
+            if _smtp_conn.noop()[0] == 250:
+                return _smtp_conn
+        except (smtplib.SMTPException, OSError):
+            pass
+        _close_smtp()
+    server = smtplib.SMTP(alerts_config["email_smtp"], 587, timeout=10)
+    try:
+        server.starttls()
+        server.login(alerts_config["email_user"], alerts_config["email_pass"])
+    except Exception:
+        server.close()  # don't leak the socket when TLS or AUTH fails
+        raise
+    _smtp_conn = server
+    _smtp_key = key
+    return server
+
+atexit.register(_close_smtp)
+
 def send_email_alert(message: str, subject="LokiAI Rebalance Alert"):
     try:
+        alerts_config = _alerts_config()
         msg = MIMEText(message)
         msg["Subject"] = subject
         msg["From"] = alerts_config["email_user"]
         msg["To"] = alerts_config["email_to"]
 
-        server = smtplib.SMTP(alerts_config["email_smtp"], 587)
-        server.starttls()
-        server.login(alerts_config["email_user"], alerts_config["email_pass"])
-        server.sendmail(alerts_config["email_user"], alerts_config["email_to"], msg.as_string())
-        server.quit()
+        with _smtp_lock:
+            try:
+                _get_smtp(alerts_config).sendmail(alerts_config["email_user"], alerts_config["email_to"], msg.as_string())
+            except smtplib.SMTPServerDisconnected:
+                # Dropped between the liveness probe and the send; retry once on a fresh session
+                _close_smtp()
+                _get_smtp(alerts_config).sendmail(alerts_config["email_user"], alerts_config["email_to"], msg.as_string())
         return "sent", None
     except Exception as e:
         return "failed", str(e)
 
+# Channel name -> sender; add new channels here
+_DISPATCH = {
+    "telegram": send_telegram_alert,
+    "discord": send_discord_alert,
+    "email": send_email_alert,
+}
+
 # --- Logging to Mongo ---
-def log_alert(wallet, event_type, alert_type, channel, status, reason, message):
-    alerts_collection.insert_one({
-        "timestamp": datetime.now(timezone.utc),
+def build_alert_doc(wallet, event_type, alert_type, channel, status, reason, message, timestamp=None):
+    return {
+        "timestamp": timestamp or now_utc(),
         "wallet": wallet,
         "event_type": event_type,
         "alert_type": alert_type,
@@ -74,20 +164,55 @@ def log_alert(wallet, event_type, alert_type, channel, status, reason, message):
         "channel": channel,
         "status": status,
         "reason": reason
-    })
+    }
+
+def log_alert(wallet, event_type, alert_type, channel, status, reason, message):
+    alerts_collection().insert_one(
+        build_alert_doc(wallet, event_type, alert_type, channel, status, reason, message)
+    )
+
+def log_alerts(docs):
+    """Write a batch of alert docs (from build_alert_doc) in a single round-trip."""
+    if docs:
+        alerts_collection().insert_many(docs, ordered=False)
 
 # --- Example trigger ---
-def send_alerts(wallet, event_type, alert_type, message):
-    for channel in alerts_config["channels"]:
-        if channel == "telegram":
-            status, reason = send_telegram_alert(message)
-            log_alert(wallet, event_type, alert_type, "telegram", status, reason, message)
-        elif channel == "discord":
-            status, reason = send_discord_alert(message)
-            log_alert(wallet, event_type, alert_type, "discord", status, reason, message)
-        elif channel == "email":
-            status, reason = send_email_alert(message)
-            log_alert(wallet, event_type, alert_type, "email", status, reason, message)
+def dispatch_alerts(message):
+    """Start delivering `message` on every configured channel; returns {channel: Future}.
+
+    Pair with `collect_alerts` to let deliveries overlap with other work (e.g. later trades).
+    """
+    futures = {}
+    for channel in _alerts_config()["channels"]:
+        fn = _DISPATCH.get(channel)
+        if fn is None:
+            continue
+        futures[channel] = _ALERT_POOL.submit(fn, message)
+    return futures
+
+def collect_alerts(wallet, event_type, alert_type, message, futures, out=None, clock=None):
+    """Wait for futures from `dispatch_alerts` and log one alert doc per channel.
+
+    Alert docs are inserted into Mongo immediately, or appended to `out` when a
+    list is given so the caller can flush them later with `log_alerts`.
+    Pass a `util.batch_now()` base as `clock` to timestamp docs without re-reading the wall clock.
+    """
+    for channel, fut in futures.items():
+        try:
+            status, reason = fut.result(timeout=ALERT_TIMEOUT_SECONDS)
+        except FutureTimeout:
+            fut.cancel()
+            status, reason = "failed", f"timed out after {ALERT_TIMEOUT_SECONDS}s"
+        ts = batch_offset(clock) if clock else None
+        doc = build_alert_doc(wallet, event_type, alert_type, channel, status, reason, message, timestamp=ts)
+        if out is None:
+            alerts_collection().insert_one(doc)
+        else:
+            out.append(doc)
+
+def send_alerts(wallet, event_type, alert_type, message, out=None):
+    """Deliver `message` on every configured channel, concurrently, and log the outcome."""
+    collect_alerts(wallet, event_type, alert_type, message, dispatch_alerts(message), out=out)
 
 if __name__ == "__main__":
     # Example test run
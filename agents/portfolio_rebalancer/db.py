@@ -1,26 +1,70 @@
 """db.py
 MongoDB helper providing a simple run/trade store.
 """
-from typing import Optional
+from typing import Optional, Union
 from datetime import datetime, timezone
+import functools
 import os
 
-from dotenv import load_dotenv
-load_dotenv()  # ✅ Ensures .env is read before MongoDBHelper uses it
+from ._bootstrap import env
+env()  # ✅ Ensures .env is read before MongoDBHelper uses it
 
 
 # Lazy import pymongo to avoid mandatory dependency at import time
 try:
-    from pymongo import MongoClient, ASCENDING
+    from pymongo import ASCENDING, DESCENDING
+    from pymongo.write_concern import WriteConcern
     from bson import ObjectId
     PYMONGO_AVAILABLE = True
 except Exception:
-    MongoClient = None  # type: ignore
     ObjectId = None  # type: ignore
+    WriteConcern = None  # type: ignore
     ASCENDING = 1  # type: ignore
+    DESCENDING = -1  # type: ignore
     PYMONGO_AVAILABLE = False
 
 from .logger import get_logger
+from ._mongo import get_client
+
+
+def log_collection(db, name: str):
+    """Return `name` with an unacknowledged (w=0) write concern.
+
+    Only for audit/log collections where losing the last few docs on a crash is acceptable;
+    `runs` and `trades` keep the default acknowledged writes.
+    """
+    return db.get_collection(name, write_concern=WriteConcern(w=0))
+
+
+@functools.lru_cache(maxsize=256)
+def _as_object_id(run_id: str):
+    """Parse a run id once; repeated log_trade calls for the same run reuse the ObjectId."""
+    return ObjectId(run_id)
+
+
+_indexed_dbs: set = set()  # (client, db name) pairs whose indexes were created successfully
+
+
+def ensure_indexes(db) -> bool:
+    """Create indexes for the agent's log collections; returns True once they exist.
+
+    Succeeds at most once per database per process; after a failure the next call retries.
+    """
+    key = (db.client, db.name)
+    if key in _indexed_dbs:
+        return True
+    try:
+        by_wallet_time = [("wallet", ASCENDING), ("timestamp", DESCENDING)]
+        db.rebalance_alerts.create_index(by_wallet_time)
+        db.executed_trades.create_index(by_wallet_time)
+        db.executed_trades.create_index([("status", ASCENDING)])
+        db.portfolio_snapshots.create_index(by_wallet_time)
+        db.rebalance_simulations.create_index(by_wallet_time)
+    except Exception as e:  # pragma: no cover
+        get_logger().warning(f"Failed to ensure MongoDB indexes: {e}")
+        return False
+    _indexed_dbs.add(key)
+    return True
 
 
 class MongoDBHelper:
@@ -43,34 +87,39 @@ class MongoDBHelper:
             raise RuntimeError("pymongo is not installed. Please 'pip install pymongo' to use MongoDB logging.")
         if self._client is None:
             self.logger.info(f"Connecting to MongoDB at {self.uri}...")
-            self._client = MongoClient(self.uri, tls=True, tlsAllowInvalidCertificates=True)  
+            self._client = get_client(self.uri)
             self._db = self._client[self.db_name]
             # Ensure basic indexes
             self._db.runs.create_index([("started_at", ASCENDING)])
             self._db.trades.create_index([("run_id", ASCENDING)])
+        if not ensure_indexes(self._db):
+            return  # keep checking so the next call retries index creation
+        # Connected and indexed: shadow this method so later calls skip the checks entirely
+        self._ensure_client = lambda: None  # type: ignore[method-assign]
 
     def close(self) -> None:
-        if self._client is not None:
-            self._client.close()
-            self._client = None
-            self._db = None
+        # The client is shared process-wide; only drop this helper's references to it
+        self.__dict__.pop("_ensure_client", None)
+        self._client = None
+        self._db = None
 
-    def log_run_start(self, started_at: Optional[str] = None, notes: str = "") -> str:
+    def log_run_start(self, started_at: Optional[str] = None, notes: str = "", return_oid: bool = False) -> Union[str, "ObjectId"]:
+        """Insert a run doc and return its id; pass `return_oid=True` to get the ObjectId for log_trade."""
         self._ensure_client()
         started_at = started_at or datetime.now(timezone.utc).isoformat()
         doc = {"started_at": started_at, "finished_at": None, "status": "running", "notes": notes}
         result = self._db.runs.insert_one(doc)
-        return str(result.inserted_id)
+        return result.inserted_id if return_oid else str(result.inserted_id)
 
-    def log_run_finish(self, run_id: str, finished_at: Optional[str] = None, status: str = "success") -> None:
+    def log_run_finish(self, run_id: Union[str, "ObjectId"], finished_at: Optional[str] = None, status: str = "success") -> None:
         self._ensure_client()
         finished_at = finished_at or datetime.now(timezone.utc).isoformat()
-        oid = ObjectId(run_id) if isinstance(run_id, str) else run_id
+        oid = _as_object_id(run_id) if isinstance(run_id, str) else run_id
         self._db.runs.update_one({"_id": oid}, {"$set": {"finished_at": finished_at, "status": status}})
 
-    def log_trade(self, run_id: str, token: str, side: str, amount: float, price: float, value_usd: float, tx_hash: Optional[str]) -> None:
+    def log_trade(self, run_id: Union[str, "ObjectId"], token: str, side: str, amount: float, price: float, value_usd: float, tx_hash: Optional[str]) -> None:
         self._ensure_client()
-        oid = ObjectId(run_id) if isinstance(run_id, str) else run_id
+        oid = _as_object_id(run_id) if isinstance(run_id, str) else run_id
         doc = {
             "run_id": oid,
             "token": token,
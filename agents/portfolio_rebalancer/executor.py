@@ -3,18 +3,15 @@ Execute rebalancing trades on a DEX and trigger alerts.
 """
 from typing import List, Dict, Any, Optional, Callable
 import os
-from datetime import datetime, timezone
 from .logger import get_logger
+from .models import Trade
 from .tracker import resolve_wallet_address
-from .alerts import send_alerts
-from dotenv import load_dotenv
-load_dotenv()
-
-
-try:  # Optional: MongoDB for executed_trades logging
-    from pymongo import MongoClient  # type: ignore
-except Exception:  # pragma: no cover
-    MongoClient = None  # type: ignore
+from .alerts import dispatch_alerts, collect_alerts, log_alerts
+from .db import ensure_indexes, log_collection
+from ._mongo import PYMONGO_AVAILABLE, get_client, get_db
+from .util import batch_now, batch_offset
+from ._bootstrap import env
+env()
 
 
 class Executor:
@@ -22,12 +19,14 @@ class Executor:
         self,
         config: Dict[str, Any],
         session_provider: Optional[Callable[[], Optional[str]]] = None,
+        wallet_address: Optional[str] = None,
     ):
+        """Pass `wallet_address` when the caller already resolved it to skip re-resolution."""
         self.config = config
         self.logger = get_logger()
         self.network = config.get("network")
         self.dex = config.get("dex")
-        self.wallet_address = resolve_wallet_address(config, session_provider=session_provider)
+        self.wallet_address = wallet_address or resolve_wallet_address(config, session_provider=session_provider)
         self.private_key = os.getenv("PRIVATE_KEY")  # Do not hardcode secrets
         self._init_mongo()
 
@@ -36,32 +35,36 @@ class Executor:
         self._executed_trades = None
         self._mongo_client = None
         self._mongo_db = None
-        if MongoClient is None:
+        if not PYMONGO_AVAILABLE:
             self.logger.warning("pymongo not installed; executed_trades will not be logged to MongoDB.")
             return
         try:
-            uri = os.getenv("MONGO_URI", "mongodb://localhost:27017")
-            # Prefer alerts DB name if provided, else portfolio_rebalancer
-            db_name = os.getenv("MONGO_DB_NAME", "loki_agents")
-            self._mongo_client = MongoClient(uri)
-            self._mongo_db = self._mongo_client[db_name]
-            self._executed_trades = self._mongo_db["executed_trades"]
+            self._mongo_client = get_client()
+            self._mongo_db = get_db()
+            self._executed_trades = log_collection(self._mongo_db, "executed_trades")
+            ensure_indexes(self._mongo_db)
         except Exception as e:  # pragma: no cover
             self.logger.error(f"Failed to initialize MongoDB client: {e}")
             self._executed_trades = None
 
-    def execute(self, trades: List[Dict[str, Any]], dry_run: bool = True) -> List[Dict[str, Any]]:
+    def execute(self, trades: List[Trade], dry_run: bool = True) -> List[Trade]:
         """
         Placeholder executor. In dry_run mode, it only logs the intent.
         - Writes results to MongoDB collection `executed_trades` when available.
-        - Triggers alerts after writing each result.
-        Returns trade results with a status and optional tx_hash.
+        - Triggers alerts for each result. Deliveries start immediately and run in the
+          background while later trades are processed; the Mongo docs for trades and
+          alerts are batched into one insert_many each.
+        Returns the input trades, updated in place with status, optional tx_hash and reason.
         """
-        results: List[Dict[str, Any]] = []
+        results: List[Trade] = []
+        trade_docs: List[Dict[str, Any]] = []
+        alert_docs: List[Dict[str, Any]] = []
+        pending_alerts = []  # (alert_type, message, {channel: Future})
+        clock = batch_now()  # one wall-clock read; per-doc timestamps are monotonic offsets
         for tr in trades:
-            side = tr.get("side", "").lower()
-            token = tr.get("token")
-            amount = tr.get("amount")
+            side = (tr.side or "").lower()
+            token = tr.token
+            amount = tr.amount
 
             status = "success"
             reason: Optional[str] = None
@@ -94,15 +97,17 @@ class Executor:
                     reason = str(e)
                     self.logger.error(f"Execution failed: {e}")
 
-            result = {**tr, "status": status, "tx_hash": tx_hash, "reason": reason}
-            results.append(result)
+            tr.status = status
+            tr.tx_hash = tx_hash
+            tr.reason = reason
+            results.append(tr)
 
-            # 1) Write result to MongoDB `executed_trades`
+            # 1) Queue result for MongoDB `executed_trades`
             if self._executed_trades is not None:
-                try:
-                    pair = (f"USDC→{token}" if side == "buy" else f"{token}→USDC") if token else "N/A"
-                    doc = {
-                        "timestamp": datetime.now(timezone.utc),
+                pair = (f"USDC→{token}" if side == "buy" else f"{token}→USDC") if token else "N/A"
+                trade_docs.append(
+                    {
+                        "timestamp": batch_offset(clock),
                         "wallet": self.wallet_address,
                         "network": self.network,
                         "dex": self.dex,
@@ -114,11 +119,9 @@ class Executor:
                         "tx_hash": tx_hash,
                         "trade_summary": pair,
                     }
-                    self._executed_trades.insert_one(doc)
-                except Exception as e:  # pragma: no cover
-                    self.logger.error(f"Failed to write executed_trades doc: {e}")
+                )
 
-            # 2) Trigger alerts after writing to MongoDB
+            # 2) Start alert delivery; outcomes are collected after the loop
             try:
                 short = (
                     f"{self.wallet_address[:6]}...{self.wallet_address[-3:]}"
@@ -127,22 +130,40 @@ class Executor:
                 )
                 if status == "success":
                     pair = (f"USDC→{token}" if side == "buy" else f"{token}→USDC") if token else "N/A"
+                    alert_type = "success"
                     message = (
                         f"✅ Rebalance executed | Wallet: {short} | Trades: {pair} | Status: SUCCESS"
                     )
-                    send_alerts(self.wallet_address, "execution", "success", message)
                 elif status == "failed":
+                    alert_type = "failure"
                     message = (
                         f"❌ Rebalance failed | Wallet: {short} | Reason: {reason or 'unknown error'}"
                     )
-                    send_alerts(self.wallet_address, "execution", "failure", message)
                 else:  # skipped
+                    alert_type = "skipped"
                     message = (
                         f"⚠️ Rebalance skipped | Wallet: {short} | {reason or 'Deviation below threshold'}"
                     )
-                    send_alerts(self.wallet_address, "execution", "skipped", message)
+                pending_alerts.append((alert_type, message, dispatch_alerts(message)))
             except Exception as e:  # pragma: no cover
                 self.logger.error(f"Failed to send alerts: {e}")
+
+        # 3) Flush batched trade docs while alert deliveries are still in flight
+        if trade_docs:
+            try:
+                self._executed_trades.insert_many(trade_docs, ordered=False)
+            except Exception as e:  # pragma: no cover
+                self.logger.error(f"Failed to write executed_trades docs: {e}")
+
+        # 4) Wait for alert outcomes and flush their docs
+        try:
+            for alert_type, message, futures in pending_alerts:
+                collect_alerts(
+                    self.wallet_address, "execution", alert_type, message, futures, out=alert_docs, clock=clock
+                )
+            log_alerts(alert_docs)
+        except Exception as e:  # pragma: no cover
+            self.logger.error(f"Failed to write alert docs: {e}")
         return results
 
 
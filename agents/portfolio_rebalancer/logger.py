@@ -1,8 +1,10 @@
 """logger.py
 Structured logging utilities for the portfolio rebalancer.
 """
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from typing import Optional
 
@@ -14,6 +16,9 @@ def get_logger(
 ) -> logging.Logger:
     """Return a configured logger with console and rotating file handlers.
 
+    Records are enqueued on the calling thread and written to console/file by a
+    background QueueListener, so logging never blocks on disk I/O.
+
     Parameters
     - name: Logger name
     - level: Logging level
@@ -29,13 +34,18 @@ def get_logger(
     # Console handler
     ch = logging.StreamHandler()
     ch.setFormatter(formatter)
-    logger.addHandler(ch)
 
     # Rotating file handler
     if log_path is None:
         log_path = Path(__file__).with_name("rebalancer.log")
     fh = RotatingFileHandler(log_path, maxBytes=1_000_000, backupCount=3)
     fh.setFormatter(formatter)
-    logger.addHandler(fh)
+
+    # Queue handler on the logger; the listener thread drains to console + file
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    listener = QueueListener(log_queue, ch, fh, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    logger.addHandler(QueueHandler(log_queue))
 
     return logger
@@ -0,0 +1,20 @@
+"""models.py
+Compact record types passed between tracker, simulator and executor.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(slots=True)
+class Trade:
+    """A proposed rebalancing trade; status/tx_hash/reason are filled in by the executor."""
+
+    token: str
+    side: str  # 'buy' | 'sell'
+    amount: float  # tokens
+    value_usd: float
+    target_allocation: float
+    current_allocation: float
+    status: Optional[str] = None
+    tx_hash: Optional[str] = None
+    reason: Optional[str] = None
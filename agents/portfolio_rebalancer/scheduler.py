@@ -2,16 +2,20 @@
 Heartbeat worker that runs tracker -> simulator -> executor at intervals.
 
 Features:
-- Saves tracker snapshots and simulation results to MongoDB.
+- Saves tracker snapshots and simulation results to MongoDB on a background pool, overlapping compute.
 - Determines viability from simulation before executing trades.
 - Sends a "skipped" alert if simulation is not viable.
 - Triggers success/failure alerts automatically via executor after execution.
+- Skips a tick entirely (no DB writes, no alerts) when balances/prices are unchanged and no trades are proposed.
 - Uses APScheduler if available; otherwise falls back to a simple sleep loop.
 """
+import hashlib
+import threading
 import time
-import os
-from datetime import datetime, timezone
-from typing import Optional, Callable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import asdict
+from datetime import datetime
+from typing import List, Optional, Callable
 
 from .logger import get_logger
 from .tracker import (
@@ -21,18 +25,16 @@ from .tracker import (
     propose_rebalance_trades,
     resolve_wallet_address,
 )
-from .simulator import simulate_trades
+from .simulator import simulate_trades_vec
 from .executor import Executor
 from .alerts import send_alerts
+from .db import ensure_indexes, log_collection
+from ._mongo import PYMONGO_AVAILABLE, get_db
+from .util import now_utc
 
 # Ensure .env variables are loaded before accessing os.getenv
-from dotenv import load_dotenv
-load_dotenv()
-
-try:
-    from pymongo import MongoClient  # type: ignore
-except Exception:  # pragma: no cover
-    MongoClient = None  # type: ignore
+from ._bootstrap import env
+env()
 
 try:
     from apscheduler.schedulers.blocking import BlockingScheduler  # type: ignore
@@ -42,60 +44,85 @@ except Exception:  # pragma: no cover
 
 logger = get_logger()
 
-_mongo_client = None
 _mongo_db = None
+_last_digest: Optional[bytes] = None  # (wallet, balances, prices) digest from the previous tick
+
+# Background pool for snapshot/simulation inserts; the semaphore bounds pending writes if Mongo stalls
+_MONGO_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="mongo-writes")
+_MONGO_SLOTS = threading.BoundedSemaphore(16)
+MONGO_WRITE_TIMEOUT_SECONDS = 5
 
 
 def _get_db():
-    global _mongo_client, _mongo_db
-    if _mongo_db is not None:
-        return _mongo_db
-    if MongoClient is None:
-        logger.warning("pymongo not installed; snapshots/simulations won't be saved to MongoDB.")
-        return None
-    uri = os.getenv("MONGO_URI", "mongodb://localhost:27017")
-    db_name = os.getenv("MONGO_DB_NAME", "loki_agents")
+    global _mongo_db
+    if _mongo_db is None:
+        if not PYMONGO_AVAILABLE:
+            logger.warning("pymongo not installed; snapshots/simulations won't be saved to MongoDB.")
+            return None
+        try:
+            _mongo_db = get_db()
+        except Exception as e:  # pragma: no cover
+            logger.error(f"Failed to connect MongoDB: {e}")
+            _mongo_db = None
+            return None
+    ensure_indexes(_mongo_db)  # no-op once created; retries after an earlier failure
+    return _mongo_db
+
+
+def _submit_write(fn: Callable[..., bool], *args) -> Future:
+    """Run `fn(*args)` on the Mongo pool, blocking the caller while too many writes are pending."""
+    _MONGO_SLOTS.acquire()
     try:
-        _mongo_client = MongoClient(uri)
-        _mongo_db = _mongo_client[db_name]
-        return _mongo_db
-    except Exception as e:  # pragma: no cover
-        logger.error(f"Failed to connect MongoDB: {e}")
-        _mongo_client = None
-        _mongo_db = None
-        return None
+        fut = _MONGO_POOL.submit(fn, *args)
+    except Exception:
+        _MONGO_SLOTS.release()
+        raise
+    fut.add_done_callback(lambda _: _MONGO_SLOTS.release())
+    return fut
+
 
+def _portfolio_digest(wallet: str, balances: dict, prices: dict) -> bytes:
+    payload = repr((wallet, sorted(balances.items()), sorted(prices.items()))).encode()
+    return hashlib.blake2b(payload, digest_size=16).digest()
 
-def _save_snapshot(db, wallet: str, balances: dict, prices: dict, total_value: float) -> None:
+
+def _save_snapshot(db, wallet: str, balances: dict, prices: dict, total_value: float, timestamp: datetime) -> bool:
+    """Insert a portfolio snapshot; returns False if nothing was written."""
     if db is None:
-        return
+        return False
     try:
-        db["portfolio_snapshots"].insert_one(
+        log_collection(db, "portfolio_snapshots").insert_one(
             {
-                "timestamp": datetime.now(timezone.utc),
+                "timestamp": timestamp,
                 "wallet": wallet,
                 "balances": balances,
                 "prices": prices,
                 "total_value": float(total_value),
             }
         )
+        return True
     except Exception as e:  # pragma: no cover
         logger.error(f"Failed to insert portfolio snapshot: {e}")
+        return False
 
 
-def _save_simulation(db, sim_doc: dict) -> None:
+def _save_simulation(db, sim_doc: dict) -> bool:
+    """Insert a simulation doc; returns False if nothing was written."""
     if db is None:
-        return
+        return False
     try:
-        db["rebalance_simulations"].insert_one(sim_doc)
+        log_collection(db, "rebalance_simulations").insert_one(sim_doc)
+        return True
     except Exception as e:  # pragma: no cover
         logger.error(f"Failed to insert simulation doc: {e}")
+        return False
 
 
 def run_once(
     dry_run: bool = True,
     session_provider: Optional[Callable[[], Optional[str]]] = None,
 ) -> None:
+    global _last_digest
     cfg = load_config()
     tokens = list(cfg.get("targets", {}).keys())
     prices = fetch_prices(tokens, cfg.get("base_currency", "USD"))
@@ -103,8 +130,15 @@ def run_once(
     balances = fetch_balances(wallet_address, tokens)
     total_value = sum(balances.get(t, 0.0) * prices.get(t, 0.0) for t in set(balances) | set(prices))
 
-    db = _get_db()
-    _save_snapshot(db, wallet_address, balances, prices, total_value)
+    digest = _portfolio_digest(wallet_address, balances, prices)
+    unchanged = digest == _last_digest
+    tick_ts = now_utc()  # shared by this tick's snapshot and simulation docs
+    db = None
+    writes: List[Future] = []
+    if not unchanged:
+        # A changed portfolio always gets a snapshot; start it now so it overlaps proposal + simulation
+        db = _get_db()
+        writes.append(_submit_write(_save_snapshot, db, wallet_address, balances, prices, total_value, tick_ts))
 
     threshold_pct = cfg.get("thresholds", {}).get("rebalance_threshold_pct", 2.5)
     min_trade_usd = cfg.get("thresholds", {}).get("min_trade_usd", 100.0)
@@ -113,7 +147,16 @@ def run_once(
         cfg.get("targets", {}), balances, prices, threshold_pct, min_trade_usd
     )
 
-    sim = simulate_trades(
+    # Quiescent portfolio: nothing changed since the last tick and nothing to do
+    if unchanged and not trades:
+        logger.info("Portfolio unchanged since last tick and no trades proposed; skipping.")
+        return
+    if unchanged:
+        # Unchanged but trades are still proposed, so this tick is recorded too
+        db = _get_db()
+        writes.append(_submit_write(_save_snapshot, db, wallet_address, balances, prices, total_value, tick_ts))
+
+    sim = simulate_trades_vec(
         trades,
         prices,
         slippage_bps=cfg.get("thresholds", {}).get("slippage_tolerance_bps", 50),
@@ -124,16 +167,26 @@ def run_once(
 
     # Save simulation document
     sim_doc = {
-        "timestamp": datetime.now(timezone.utc),
+        "timestamp": tick_ts,
         "wallet": wallet_address,
         "tokens": tokens,
-        "trades": trades,
+        "trades": [asdict(t) for t in trades],
         "summary": sim.get("summary", {}),
         "status": "skipped" if not trades else "proposed",
         "viable": bool(trades),
         "reason": None if trades else "no trades proposed (below thresholds or no deviation)",
     }
-    _save_simulation(db, sim_doc)
+    writes.append(_submit_write(_save_simulation, db, sim_doc))
+
+    # Let this tick's writes land before alerts/execution add their own Mongo traffic
+    done, pending = wait(writes, timeout=MONGO_WRITE_TIMEOUT_SECONDS)
+    if pending:
+        logger.warning(f"{len(pending)} MongoDB write(s) still pending after {MONGO_WRITE_TIMEOUT_SECONDS}s")
+    # Only remember this state once it is persisted, so a failed tick is retried next time
+    if not pending and all(f.result() for f in done):
+        _last_digest = digest
+    else:
+        _last_digest = None
 
     # Decide viability
     if not trades:
@@ -151,7 +204,7 @@ def run_once(
         return
 
     # Execute when viable; executor will send alerts for success/failure/skipped (runtime reasons)
-    execu = Executor(cfg, session_provider=session_provider)
+    execu = Executor(cfg, session_provider=session_provider, wallet_address=wallet_address)
     results = execu.execute(trades, dry_run=dry_run)
     logger.info(f"Execution results: {results}")
 
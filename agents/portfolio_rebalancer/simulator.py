@@ -3,6 +3,10 @@ Simulate trades considering slippage, gas fees, and placeholder DEX quotes.
 """
 from typing import Dict, List, Any
 
+import numpy as np
+
+from .models import Trade
+
 
 def bps_to_fraction(bps: float) -> float:
     return max(float(bps) / 10000.0, 0.0)
@@ -25,20 +29,20 @@ def get_dex_quote(
 
 
 def estimate_trade(
-    trade: Dict[str, Any],
+    trade: Trade,
     price: float,
     slippage_bps: float,
     gas_cost_usd: float,
     dex: str,
 ) -> Dict[str, Any]:
-    side = trade.get("side")
-    amount = float(trade.get("amount", 0.0))
-    quoted_price = get_dex_quote(dex, trade.get("token"), side, amount, price, slippage_bps)
+    side = trade.side
+    amount = float(trade.amount)
+    quoted_price = get_dex_quote(dex, trade.token, side, amount, price, slippage_bps)
 
     if side == "buy":
         cost_usd = amount * quoted_price + float(gas_cost_usd)
         return {
-            "token": trade.get("token"),
+            "token": trade.token,
             "side": side,
             "amount": amount,
             "quoted_price": quoted_price,
@@ -49,7 +53,7 @@ def estimate_trade(
         if proceeds_usd < 0:
             proceeds_usd = 0.0
         return {
-            "token": trade.get("token"),
+            "token": trade.token,
             "side": side,
             "amount": amount,
             "quoted_price": quoted_price,
@@ -58,30 +62,47 @@ def estimate_trade(
 
 
 def simulate_trades(
-    trades: List[Dict[str, Any]],
+    trades: List[Trade],
     prices: Dict[str, float],
     slippage_bps: float = 50.0,
     gas_cost_usd: float = 5.0,
     dex: str = "uniswap_v2",
 ) -> Dict[str, Any]:
-    """Simulate a list of trades and provide per-trade and summary estimates."""
+    """Simulate a list of trades and provide per-trade and summary estimates.
+
+    Same math as `estimate_trade`, inlined with the slippage multipliers computed once up front.
+    """
     results: List[Dict[str, Any]] = []
     total_buy_cost = 0.0
     total_sell_proceeds = 0.0
     total_gas_usd = 0.0
 
+    slip = bps_to_fraction(slippage_bps)
+    buy_mul = 1.0 + slip
+    sell_mul = 1.0 - slip
+    gas = float(gas_cost_usd)
+
     for tr in trades:
-        token = tr.get("token")
-        price = float(prices.get(token, 0.0))
+        price = float(prices.get(tr.token, 0.0))
         if price <= 0:
             continue
-        res = estimate_trade(tr, price, slippage_bps, gas_cost_usd, dex)
-        results.append(res)
-        if tr.get("side") == "buy":
-            total_buy_cost += res.get("cost_usd", 0.0)
+        side = tr.side
+        amount = float(tr.amount)
+        if side == "buy":
+            quoted_price = price * buy_mul
+            cost_usd = amount * quoted_price + gas
+            results.append(
+                {"token": tr.token, "side": side, "amount": amount, "quoted_price": quoted_price, "cost_usd": cost_usd}
+            )
+            total_buy_cost += cost_usd
         else:
-            total_sell_proceeds += res.get("proceeds_usd", 0.0)
-        total_gas_usd += gas_cost_usd
+            quoted_price = price * sell_mul
+            proceeds_usd = max(amount * quoted_price - gas, 0.0)
+            results.append(
+                {"token": tr.token, "side": side, "amount": amount, "quoted_price": quoted_price, "proceeds_usd": proceeds_usd}
+            )
+            total_sell_proceeds += proceeds_usd
+        total_gas_usd += gas
 
     summary = {
         "total_buy_cost_usd": total_buy_cost,
@@ -90,3 +111,52 @@ def simulate_trades(
         "est_total_gas_usd": total_gas_usd,
     }
     return {"trades": results, "summary": summary}
+
+
+def simulate_trades_vec(
+    trades: List[Trade],
+    prices: Dict[str, float],
+    slippage_bps: float = 50.0,
+    gas_cost_usd: float = 5.0,
+    dex: str = "uniswap_v2",
+    include_trades: bool = False,
+) -> Dict[str, Any]:
+    """Vectorized `simulate_trades`.
+
+    Computes the summary in one NumPy pass; per-trade estimates are only built
+    when `include_trades` is set, otherwise "trades" is an empty list.
+    """
+    n = len(trades)
+    pxs = np.fromiter((float(prices.get(tr.token, 0.0)) for tr in trades), dtype=np.float64, count=n)
+    keep = pxs > 0
+    pxs = pxs[keep]
+    is_buy = np.fromiter((tr.side == "buy" for tr in trades), dtype=bool, count=n)[keep]
+    amts = np.fromiter((float(tr.amount) for tr in trades), dtype=np.float64, count=n)[keep]
+
+    slip = bps_to_fraction(slippage_bps)
+    gas = float(gas_cost_usd)
+    quoted = pxs * np.where(is_buy, 1.0 + slip, 1.0 - slip)
+    gross = amts * quoted
+    cost = np.where(is_buy, gross + gas, 0.0)
+    proceeds = np.where(is_buy, 0.0, np.maximum(gross - gas, 0.0))
+
+    total_buy_cost = float(cost.sum())
+    total_sell_proceeds = float(proceeds.sum())
+    summary = {
+        "total_buy_cost_usd": total_buy_cost,
+        "total_sell_proceeds_usd": total_sell_proceeds,
+        "net_usd_effect": total_sell_proceeds - total_buy_cost,
+        "est_total_gas_usd": gas * int(keep.sum()),
+    }
+
+    results: List[Dict[str, Any]] = []
+    if include_trades:
+        kept = (tr for tr, k in zip(trades, keep) if k)
+        for tr, buy, amt, qp, c, p in zip(kept, is_buy, amts, quoted, cost, proceeds):
+            res = {"token": tr.token, "side": tr.side, "amount": float(amt), "quoted_price": float(qp)}
+            if buy:
+                res["cost_usd"] = float(c)
+            else:
+                res["proceeds_usd"] = float(p)
+            results.append(res)
+    return {"trades": results, "summary": summary}
@@ -2,21 +2,27 @@
 Fetch balances and prices, compare with targets, and propose rebalancing trades.
 This module contains minimal placeholders that are safe to import. Fill in on-chain balance/price fetching later.
 """
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Optional, Callable
 from pathlib import Path
-import json
 import os
 
+import numpy as np
+import orjson
+
+from .models import Trade
+
 # Ensure .env variables are loaded before accessing os.getenv
-from dotenv import load_dotenv
-load_dotenv()
+from ._bootstrap import env, get_config
+env()
 
 
 def load_config(config_path: Optional[str] = None) -> dict:
-    """Load JSON config from `config.json` by default."""
-    p = Path(config_path) if config_path else Path(__file__).with_name("config.json")
-    with p.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    """Load JSON config from `config.json` by default (cached until the file changes)."""
+    if not config_path:
+        return get_config()
+    p = Path(config_path)
+    with p.open("rb") as f:
+        return orjson.loads(f.read())
 
 
 def resolve_wallet_address(
@@ -88,40 +94,39 @@ def propose_rebalance_trades(
     prices: Dict[str, float],
     threshold_pct: float,
     min_trade_usd: float,
-) -> List[Dict[str, Any]]:
+) -> List[Trade]:
     """
     Produce a naive list of buy/sell trades to move from current allocation towards target allocation.
-    Returns trades with: token, side ('buy'|'sell'), amount (tokens), value_usd, target_allocation, current_allocation.
+    Returns `Trade` records with: token, side ('buy'|'sell'), amount (tokens), value_usd, target_allocation, current_allocation.
+    The per-token math runs as a single NumPy pass; records are only built for tokens that need a trade.
     """
     tokens = list(targets.keys())
-    curr_alloc = current_allocations(balances, prices, tokens)
     total_value = compute_portfolio_value(balances, prices)
-    trades: List[Dict[str, Any]] = []
-
-    for t in tokens:
-        target = float(targets.get(t, 0.0))
-        current = float(curr_alloc.get(t, 0.0))
-        delta = target - current  # positive => need to buy, negative => need to sell
-        if total_value <= 0:
-            continue
-        desired_value_change = delta * total_value
-        # Apply thresholds
-        if abs(desired_value_change) < max(min_trade_usd, (threshold_pct / 100.0) * total_value):
-            continue
-        price = prices.get(t, 0.0)
-        if price <= 0:
-            continue
-        amount = abs(desired_value_change) / price
-        side = "buy" if delta > 0 else "sell"
+    if total_value <= 0 or not tokens:
+        return []
+
+    n = len(tokens)
+    tgt = np.fromiter((float(targets[t]) for t in tokens), dtype=np.float64, count=n)
+    bal = np.fromiter((balances.get(t, 0.0) for t in tokens), dtype=np.float64, count=n)
+    prc = np.fromiter((prices.get(t, 0.0) for t in tokens), dtype=np.float64, count=n)
+
+    curr = (bal * prc) / total_value
+    delta = tgt - curr  # positive => need to buy, negative => need to sell
+    change_usd = np.abs(delta * total_value)
+    # Apply thresholds and skip tokens without a usable price
+    mask = (change_usd >= max(min_trade_usd, (threshold_pct / 100.0) * total_value)) & (prc > 0)
+
+    trades: List[Trade] = []
+    for i in np.flatnonzero(mask):
         trades.append(
-            {
-                "token": t,
-                "side": side,
-                "amount": float(amount),
-                "value_usd": float(abs(desired_value_change)),
-                "target_allocation": target,
-                "current_allocation": current,
-            }
+            Trade(
+                token=tokens[i],
+                side="buy" if delta[i] > 0 else "sell",
+                amount=float(change_usd[i] / prc[i]),
+                value_usd=float(change_usd[i]),
+                target_allocation=float(tgt[i]),
+                current_allocation=float(curr[i]),
+            )
         )
     return trades
 
@@ -0,0 +1,22 @@
+"""util.py
+Small shared helpers.
+"""
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Tuple
+
+
+def now_utc() -> datetime:
+    """Current time as an aware UTC datetime."""
+    return datetime.now(timezone.utc)
+
+
+def batch_now() -> Tuple[datetime, int]:
+    """Capture a wall-clock base plus monotonic reference for timestamping a batch of docs."""
+    return datetime.now(timezone.utc), time.monotonic_ns()
+
+
+def batch_offset(base: Tuple[datetime, int]) -> datetime:
+    """Timestamp derived from a `batch_now()` base without another wall-clock read."""
+    t, t0 = base
+    return t + timedelta(microseconds=(time.monotonic_ns() - t0) // 1000)